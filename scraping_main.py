@@ -1,6 +1,17 @@
-from utils.transform import transform_data
-from utils.load import save_data_csv, Save_data_google_sheets
+from utils.transform import transform_pages
+from utils.load import (
+    save_data_csv, upload_google_sheets, upload_google_sheets_batch, save_data_sqlite, save_data_parquet,
+    register_sink, load_to_sinks
+)
 from utils.extract import scrape_product 
+from utils.distributed import scrape_distributed
+from utils.history import save_price_history
+from utils.cache import CardCache, PartitionCache
+from utils.latency import HedgedFetcher
+from utils.profiling import StageProfiler
+import argparse
+import os
+import sqlite3
  
 HEADERS = {
     "User-Agent": (
@@ -9,32 +20,140 @@ HEADERS = {
     )
 }
 
-def main():
-    """Fungsi utama untuk keseluruhan proses scraping hingga menyimpannya."""
-    BASE_URL = 'https://fashion-studio.dicoding.dev/'
-    all_products = scrape_product(BASE_URL)
-    for halaman in range(2, 51):
-        url_halaman = f"{BASE_URL}page{halaman}"
-        print(f"Scraping halaman {halaman}: {url_halaman}")
-        try:
-            produk = scrape_product(url_halaman)
-            all_products.extend(produk)
-        except Exception as e:
-            print(f"❌ Gagal scraping halaman {halaman}: {e}")
-
-    if not all_products:
-        print("❌ Tidak ada produk yang berhasil di-scrape. Program dihentikan.")
-        return
- 
+BASE_URL = 'https://fashion-studio.dicoding.dev/'
+SINK_NAMES = ['csv', 'sheets', 'sheets_batch', 'sqlite', 'parquet', 'history']
+
+
+def parse_sinks(value):
+    """Pecah daftar sink dari CLI dan tolak nama yang tidak dikenal sebelum scraping dimulai."""
+    names = [nama.strip() for nama in value.split(',') if nama.strip()]
+    unknown = [nama for nama in names if nama not in SINK_NAMES]
+    if not names or unknown:
+        raise argparse.ArgumentTypeError(
+            f"sink tidak dikenal: {', '.join(unknown) or '(kosong)'} (pilihan: {', '.join(SINK_NAMES)})"
+        )
+    return names
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping produk Fashion Studio.")
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help="Jumlah proses worker untuk mode terdistribusi (default: 1, sekuensial)."
+    )
+    parser.add_argument(
+        '--queue-db', default='crawl_queue.db',
+        help="Lokasi file SQLite untuk antrean job mode terdistribusi."
+    )
+    parser.add_argument(
+        '--card-cache', default=None, metavar='PATH',
+        help="Aktifkan cache ekstraksi per card (SQLite) di lokasi ini."
+    )
+    parser.add_argument(
+        '--transform-cache', default=None, metavar='PATH',
+        help="Aktifkan transform inkremental per halaman dengan cache partisi (SQLite) di lokasi ini."
+    )
+    parser.add_argument(
+        '--hedge-budget', type=int, default=None, metavar='N',
+        help="Aktifkan timeout adaptif per host dengan maksimal N hedged request untuk seluruh run, "
+             "dipakai bersama oleh semua worker (0: tanpa hedging)."
+    )
+    parser.add_argument(
+        '--sinks', default=['csv', 'sheets'], type=parse_sinks,
+        help=f"Daftar tujuan penyimpanan dipisah koma: {', '.join(SINK_NAMES)} (default: csv,sheets)."
+    )
+    parser.add_argument(
+        '--profile', default=os.environ.get('SCRAPER_PROFILE'), metavar='DIR',
+        help="Aktifkan profiling cProfile/tracemalloc per tahap dan simpan hasilnya di DIR "
+             "(bisa juga lewat env SCRAPER_PROFILE)."
+    )
+    return parser.parse_args(argv)
+
 
-    data_bersih = transform_data(all_products)
-    
-    save_data_csv(data_bersih)
-    Save_data_google_sheets(
-        data_bersih,
+def register_default_sinks():
+    """Daftarkan sink bawaan beserta kebijakan retry dan timeout masing-masing."""
+    register_sink('csv', save_data_csv, retries=1, timeout=30)
+    register_sink(
+        'sheets', upload_google_sheets, retries=2, timeout=60, backoff=2.0,
         spreadsheet_id='1dVpaL0HkhyklGtbLQfhxhXwzUB7YLg2iICX4YeGZA3I',
         range_sheet='Sheet1!A2'
     )
+    # Mode batch: upload per chunk dan lanjut dari checkpoint saat sink dicoba ulang
+    register_sink(
+        'sheets_batch', upload_google_sheets_batch, retries=2, timeout=300, backoff=2.0,
+        spreadsheet_id='1dVpaL0HkhyklGtbLQfhxhXwzUB7YLg2iICX4YeGZA3I',
+        range_sheet='Sheet1!A2', checkpoint_file='sheets_upload.checkpoint.json'
+    )
+    register_sink('sqlite', save_data_sqlite, retries=1, timeout=30)
+    register_sink('history', save_price_history, retries=1, timeout=30)
+    register_sink('parquet', save_data_parquet, retries=0, timeout=30)
+
+
+def extract_all(args):
+    """Scrape semua halaman, secara sekuensial atau dengan beberapa worker.
+
+    Mengembalikan daftar (url, daftar produk) per halaman.
+    """
+    if args.workers > 1:
+        urls = [BASE_URL] + [f"{BASE_URL}page{halaman}" for halaman in range(2, 51)]
+        return scrape_distributed(
+            urls, jumlah_worker=args.workers, db_path=args.queue_db,
+            cache_path=args.card_cache, hedge_budget=args.hedge_budget
+        )
+
+    cache = CardCache(args.card_cache) if args.card_cache else None
+    fetcher = HedgedFetcher(hedge_budget=args.hedge_budget) if args.hedge_budget is not None else None
+    try:
+        pages = [(BASE_URL, scrape_product(BASE_URL, cache=cache, fetcher=fetcher))]
+        for halaman in range(2, 51):
+            url_halaman = f"{BASE_URL}page{halaman}"
+            print(f"Scraping halaman {halaman}: {url_halaman}")
+            try:
+                produk = scrape_product(url_halaman, cache=cache, fetcher=fetcher)
+                pages.append((url_halaman, produk))
+            except Exception as e:
+                print(f"❌ Gagal scraping halaman {halaman}: {e}")
+    finally:
+        if fetcher is not None:
+            fetcher.close()
+    return pages
+
+
+def main(argv=None):
+    """Fungsi utama untuk keseluruhan proses scraping hingga menyimpannya."""
+    args = parse_args(argv)
+    profiler = StageProfiler(args.profile)
+
+    try:
+        with profiler.stage('extract'):
+            pages = extract_all(args)
+
+        if not any(produk for _, produk in pages):
+            print("❌ Tidak ada produk yang berhasil di-scrape. Program dihentikan.")
+            return
+
+        with profiler.stage('transform'):
+            cache = None
+            if args.transform_cache:
+                try:
+                    cache = PartitionCache(args.transform_cache)
+                except sqlite3.Error as e:
+                    print(f"⚠️ Cache transform tidak bisa dibuka, transform tanpa cache: {e}")
+            data_bersih = transform_pages(pages, cache=cache)
+
+        with profiler.stage('load'):
+            register_default_sinks()
+            hasil_load = load_to_sinks(data_bersih, args.sinks)
+            for nama, hasil in hasil_load.items():
+                if hasil.skipped:
+                    print(f"⏭️ Sink {nama} dilewati: {hasil.error}")
+                elif hasil.ok:
+                    print(f"✅ Sink {nama}: {hasil.attempts} percobaan, {hasil.duration:.2f} detik")
+                else:
+                    print(f"❌ Sink {nama} gagal setelah {hasil.attempts} percobaan: {hasil.error}")
+    finally:
+        profiler.write_summary()
+
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
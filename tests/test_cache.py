@@ -0,0 +1,81 @@
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import pandas as pd
+from utils.cache import CardCache, PartitionCache, hash_html, fingerprint_records
+
+
+class TestCardCache(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "cache.db")
+
+    def tearDown(self):
+        """Cleanup setelah setiap test case"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_hash_html_stable(self):
+        """Test hash sama untuk HTML yang sama dan berbeda jika HTML berubah"""
+        self.assertEqual(hash_html("<div>A</div>"), hash_html("<div>A</div>"))
+        self.assertNotEqual(hash_html("<div>A</div>"), hash_html("<div>B</div>"))
+
+    def test_put_and_get_persistent(self):
+        """Test record tersimpan dan bisa dibaca dari instance baru"""
+        CardCache(self.db_path).put_many([("k1", {'title': 'Product 1'})])
+
+        cache = CardCache(self.db_path)
+        self.assertEqual(cache.get_many(["k1", "k2"]), {"k1": {'title': 'Product 1'}})
+
+    def test_get_many_empty(self):
+        """Test get_many tanpa key"""
+        self.assertEqual(CardCache(self.db_path).get_many([]), {})
+
+    def test_lru_eviction(self):
+        """Test entri yang paling lama tidak dipakai dihapus saat melebihi batas"""
+        cache = CardCache(self.db_path, max_entries=2)
+        cache.put_many([("k1", {'title': '1'})])
+        cache.put_many([("k2", {'title': '2'})])
+        # k1 dipakai lagi sehingga k2 menjadi yang paling lama
+        cache.get_many(["k1"])
+        cache.put_many([("k3", {'title': '3'})])
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(set(cache.get_many(["k1", "k2", "k3"])), {"k1", "k3"})
+
+
+class TestPartitionCache(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = PartitionCache(os.path.join(self.temp_dir, "transform.db"))
+        self.df = pd.DataFrame({'title': ['Product 1'], 'price': [800000.0], 'colors': [3]})
+
+    def tearDown(self):
+        """Cleanup setelah setiap test case"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_fingerprint_records(self):
+        """Test fingerprint berubah jika konten mentah halaman berubah"""
+        records = [{'title': 'Product 1', 'price': '$50.00'}]
+        self.assertEqual(fingerprint_records(records), fingerprint_records([dict(records[0])]))
+        self.assertNotEqual(fingerprint_records(records), fingerprint_records([{'title': 'Product 1', 'price': '$60.00'}]))
+
+    def test_get_only_matching_fingerprint(self):
+        """Test partisi hanya dipakai ulang jika fingerprint sama"""
+        self.cache.put_many([("page1", "fp-1", self.df)])
+
+        hit = self.cache.get_many({"page1": "fp-1"})
+        miss = self.cache.get_many({"page1": "fp-2", "page2": "fp-1"})
+
+        pd.testing.assert_frame_equal(hit["page1"], self.df)
+        self.assertEqual(miss, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
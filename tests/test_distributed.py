@@ -0,0 +1,159 @@
+import unittest
+from unittest.mock import patch
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.distributed import JobQueue, run_worker
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "queue.db")
+        self.urls = [
+            "https://fashion-studio.dicoding.dev/",
+            "https://fashion-studio.dicoding.dev/page2",
+        ]
+        self.queue = JobQueue(self.db_path, lease_timeout=60, max_attempts=2)
+        self.queue.enqueue(self.urls)
+
+    def tearDown(self):
+        """Cleanup setelah setiap test case"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_lease_order_and_exhaustion(self):
+        """Test lease mengambil job sesuai urutan lalu None saat habis"""
+        self.assertEqual(self.queue.lease("w1"), self.urls[0])
+        self.assertEqual(self.queue.lease("w2"), self.urls[1])
+        self.assertIsNone(self.queue.lease("w3"))
+        self.assertFalse(self.queue.is_done())
+
+    def test_enqueue_no_duplicates(self):
+        """Test URL yang sama tidak masuk antrean dua kali"""
+        self.queue.enqueue(self.urls)
+        self.queue.lease("w1")
+        self.queue.lease("w1")
+        self.assertIsNone(self.queue.lease("w1"))
+
+    def test_complete_and_results(self):
+        """Test hasil digabung sesuai urutan antrean"""
+        url1 = self.queue.lease("w1")
+        url2 = self.queue.lease("w2")
+        self.assertTrue(self.queue.complete(url2, "w2", [{'title': 'B'}]))
+        self.assertTrue(self.queue.complete(url1, "w1", [{'title': 'A'}]))
+
+        self.assertTrue(self.queue.is_done())
+        self.assertEqual(
+            self.queue.page_results(),
+            [(url1, [{'title': 'A'}]), (url2, [{'title': 'B'}])]
+        )
+
+    def test_complete_wrong_worker_ignored(self):
+        """Test worker lain tidak bisa menyelesaikan job yang bukan miliknya"""
+        url = self.queue.lease("w1")
+        self.assertFalse(self.queue.complete(url, "w2", []))
+
+    def test_fail_requeue_then_permanent(self):
+        """Test job gagal dikembalikan ke antrean hingga batas percobaan"""
+        url = self.queue.lease("w1")
+        self.queue.fail(url, "w1", "Network error")
+        self.assertEqual(self.queue.lease("w1"), url)
+        self.queue.fail(url, "w1", "Network error")
+
+        self.assertEqual(self.queue.failures(), {url: "Network error"})
+
+    @patch('utils.distributed.sqlite3.connect')
+    def test_lease_begin_failure_not_masked(self, mock_connect):
+        """Test error asli dari BEGIN IMMEDIATE tidak tertutup error ROLLBACK"""
+        conn = mock_connect.return_value
+        conn.in_transaction = False
+        conn.execute.side_effect = [None, sqlite3.OperationalError("database is locked")]
+
+        with self.assertRaises(sqlite3.OperationalError) as context:
+            self.queue.lease("w1")
+
+        self.assertIn("database is locked", str(context.exception))
+
+    def test_expired_lease_requeued(self):
+        """Test lease dari worker yang mati dikembalikan ke antrean"""
+        queue = JobQueue(self.db_path, lease_timeout=0, max_attempts=2)
+        url = queue.lease("dead-worker")
+        time.sleep(0.01)
+        self.assertEqual(queue.lease("w2"), url)
+        # Worker lama tidak boleh lagi menimpa hasil
+        self.assertFalse(queue.complete(url, "dead-worker", []))
+
+    def test_page_results(self):
+        """Test hasil per halaman dikembalikan bersama URL-nya"""
+        url1 = self.queue.lease("w1")
+        url2 = self.queue.lease("w1")
+        self.queue.complete(url1, "w1", [{'title': 'A'}])
+        self.queue.complete(url2, "w1", [])
+
+        self.assertEqual(self.queue.page_results(), [(url1, [{'title': 'A'}]), (url2, [])])
+
+    def test_shared_budget_across_queues(self):
+        """Test budget bersama dihitung sekali untuk semua worker yang memakai database sama"""
+        self.queue.set_budget("hedge", 3)
+        worker_lain = JobQueue(self.db_path)
+
+        taken = [self.queue.take_budget("hedge"), worker_lain.take_budget("hedge"),
+                 self.queue.take_budget("hedge"), worker_lain.take_budget("hedge")]
+
+        self.assertEqual(taken, [True, True, True, False])
+        self.assertFalse(self.queue.take_budget("lain"))
+
+
+class TestRunWorker(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "queue.db")
+
+    def tearDown(self):
+        """Cleanup setelah setiap test case"""
+        shutil.rmtree(self.temp_dir)
+
+    @patch('utils.distributed.scrape_product')
+    def test_run_worker_drains_queue(self, mock_scrape):
+        """Test worker memproses semua job hingga antrean kosong"""
+        mock_scrape.side_effect = lambda url, **kwargs: [{'title': url}]
+        queue = JobQueue(self.db_path)
+        queue.enqueue(["url-1", "url-2", "url-3"])
+
+        run_worker(self.db_path, "w1")
+
+        self.assertTrue(queue.is_done())
+        self.assertEqual(
+            queue.page_results(),
+            [
+                ('url-1', [{'title': 'url-1'}]),
+                ('url-2', [{'title': 'url-2'}]),
+                ('url-3', [{'title': 'url-3'}]),
+            ]
+        )
+
+    @patch('utils.distributed.scrape_product')
+    def test_run_worker_records_failure(self, mock_scrape):
+        """Test worker mencatat job yang selalu gagal"""
+        mock_scrape.side_effect = Exception("Gagal mengakses url-1")
+        queue = JobQueue(self.db_path, max_attempts=2)
+        queue.enqueue(["url-1"])
+
+        with patch('builtins.print'):
+            run_worker(self.db_path, "w1", max_attempts=2)
+
+        self.assertEqual(mock_scrape.call_count, 2)
+        self.assertIn("url-1", queue.failures())
+        self.assertEqual(queue.page_results(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,10 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.extract import scrape_product
+from utils.cache import CardCache
+import tempfile
+import shutil
+import sqlite3
 
 
 class TestScrapeProduct(unittest.TestCase):
@@ -163,6 +167,83 @@ class TestScrapeProduct(unittest.TestCase):
         self.assertIn("Gagal mengakses", str(context.exception))
         self.assertIn("Request timeout", str(context.exception))
 
+    @patch('utils.extract.extract_card')
+    @patch('utils.extract.requests.get')
+    def test_scrape_product_with_card_cache(self, mock_get, mock_extract_card):
+        """Test card yang tidak berubah diambil dari cache tanpa ekstraksi ulang"""
+        mock_response = Mock()
+        mock_response.text = self.mock_html
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+        mock_extract_card.side_effect = lambda card: {'title': card.h3.text}
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            cache = CardCache(os.path.join(temp_dir, "cache.db"))
+            first = scrape_product(self.test_url, cache=cache)
+            second = scrape_product(self.test_url, cache=cache)
+        finally:
+            shutil.rmtree(temp_dir)
+
+        # Ekstraksi hanya dilakukan pada run pertama
+        self.assertEqual(mock_extract_card.call_count, 2)
+        self.assertEqual(first, second)
+        self.assertEqual(second[0]['title'], 'Test Product 1')
+
+    @patch('utils.extract.extract_card')
+    @patch('utils.extract.requests.get')
+    def test_scrape_product_extract_version_invalidates_cache(self, mock_get, mock_extract_card):
+        """Test perubahan EXTRACT_VERSION membuat record lama di cache tidak dipakai"""
+        mock_response = Mock()
+        mock_response.text = self.mock_html
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+        mock_extract_card.side_effect = lambda card: {'title': card.h3.text}
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            cache = CardCache(os.path.join(temp_dir, "cache.db"))
+            scrape_product(self.test_url, cache=cache)
+            with patch('utils.extract.EXTRACT_VERSION', 2):
+                scrape_product(self.test_url, cache=cache)
+        finally:
+            shutil.rmtree(temp_dir)
+
+        # Kedua card diekstrak ulang setelah versi dinaikkan
+        self.assertEqual(mock_extract_card.call_count, 4)
+
+    @patch('utils.extract.requests.get')
+    def test_scrape_product_with_fetcher(self, mock_get):
+        """Test halaman diambil melalui fetcher jika diberikan"""
+        mock_response = Mock()
+        mock_response.text = self.mock_html
+        mock_response.raise_for_status.return_value = None
+        fetcher = Mock()
+        fetcher.get.return_value = mock_response
+
+        result = scrape_product(self.test_url, fetcher=fetcher)
+
+        self.assertEqual(len(result), 2)
+        fetcher.get.assert_called_once_with(self.test_url)
+        mock_get.assert_not_called()
+
+    @patch('utils.extract.requests.get')
+    def test_scrape_product_cache_error_fallback(self, mock_get):
+        """Test error pada cache tidak menggagalkan halaman, card tetap diekstrak"""
+        mock_response = Mock()
+        mock_response.text = self.mock_html
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+        cache = Mock()
+        cache.get_many.side_effect = sqlite3.OperationalError("database is locked")
+        cache.put_many.side_effect = sqlite3.OperationalError("database is locked")
+
+        with patch('builtins.print'):
+            result = scrape_product(self.test_url, cache=cache)
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[1]['title'], 'Test Product 2')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
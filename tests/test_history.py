@@ -0,0 +1,99 @@
+import unittest
+import pandas as pd
+from datetime import datetime
+import os
+import shutil
+import tempfile
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from unittest.mock import patch
+from utils.history import PriceHistory, save_price_history
+
+
+def buat_df(rows):
+    return pd.DataFrame(rows, columns=['title', 'price', 'rating', 'timestamp'])
+
+
+class TestPriceHistory(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.history = PriceHistory(os.path.join(self.temp_dir, "history.db"))
+
+    def tearDown(self):
+        """Cleanup setelah setiap test case"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_append_empty_dataframe(self):
+        """Test append DataFrame kosong tidak menyimpan apa pun"""
+        self.assertEqual(self.history.append(buat_df([])), 0)
+        self.assertTrue(self.history.price_trend('Product 1').empty)
+
+    def test_daily_rollup_across_appends(self):
+        """Test rollup harian diperbarui secara inkremental antar append"""
+        self.history.append(buat_df([
+            ['Product 1', 800000.0, 4.5, '2024-01-01 08:00:00'],
+            ['Product 2', 500000.0, 4.0, '2024-01-01 08:00:00'],
+        ]))
+        self.history.append(buat_df([
+            ['Product 1', 600000.0, 4.7, '2024-01-01 20:00:00'],
+        ]))
+
+        trend = self.history.price_trend('Product 1')
+
+        self.assertEqual(len(trend), 1)
+        row = trend.iloc[0]
+        self.assertEqual(row['min_price'], 600000.0)
+        self.assertEqual(row['max_price'], 800000.0)
+        self.assertEqual(row['avg_price'], 700000.0)
+        self.assertEqual(row['first_rating'], 4.5)
+        self.assertEqual(row['last_rating'], 4.7)
+        self.assertAlmostEqual(row['rating_change'], 0.2)
+
+    def test_price_trend_date_range(self):
+        """Test tren harga dibatasi rentang tanggal"""
+        self.history.append(buat_df([
+            ['Product 1', 800000.0, 4.5, '2024-01-01 08:00:00'],
+            ['Product 1', 750000.0, 4.5, '2024-01-02 08:00:00'],
+            ['Product 1', 700000.0, 4.5, '2024-01-03 08:00:00'],
+        ]))
+
+        trend = self.history.price_trend('Product 1', start_day='2024-01-02')
+
+        self.assertListEqual(list(trend['day']), ['2024-01-02', '2024-01-03'])
+        self.assertListEqual(list(trend['avg_price']), [750000.0, 700000.0])
+
+    def test_biggest_price_drops(self):
+        """Test produk dengan penurunan harga terbesar minggu ini"""
+        self.history.append(buat_df([
+            ['Product 1', 800000.0, 4.5, '2024-01-05 08:00:00'],
+            ['Product 2', 500000.0, 4.0, '2024-01-05 08:00:00'],
+            ['Product 3', 300000.0, 4.0, '2024-01-05 08:00:00'],
+            ['Old Product', 900000.0, 4.0, '2023-12-01 08:00:00'],
+        ]))
+        self.history.append(buat_df([
+            ['Product 1', 700000.0, 4.5, '2024-01-07 08:00:00'],
+            ['Product 2', 200000.0, 4.0, '2024-01-07 08:00:00'],
+            ['Product 3', 350000.0, 4.0, '2024-01-07 08:00:00'],
+            ['Old Product', 100000.0, 4.0, '2024-01-07 08:00:00'],
+        ]))
+
+        drops = self.history.biggest_price_drops(days=7, today=datetime(2024, 1, 8))
+
+        self.assertListEqual(list(drops['title']), ['Product 2', 'Product 1'])
+        self.assertListEqual(list(drops['price_drop']), [300000.0, 100000.0])
+
+    def test_save_price_history_sink(self):
+        """Test fungsi sink history menambahkan observasi ke db yang diberikan"""
+        db_path = os.path.join(self.temp_dir, "sink.db")
+
+        with patch('builtins.print'):
+            save_price_history(buat_df([['Product 1', 800000.0, 4.5, '2024-01-01 08:00:00']]), db_path)
+
+        trend = PriceHistory(db_path).price_trend('Product 1')
+        self.assertEqual(list(trend['avg_price']), [800000.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
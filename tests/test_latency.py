@@ -0,0 +1,177 @@
+import unittest
+from unittest.mock import Mock, patch
+import threading
+import time
+import requests
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.latency import LatencyTracker, HedgedFetcher
+
+
+class TestLatencyTracker(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        self.url = "https://fashion-studio.dicoding.dev/page2"
+        self.tracker = LatencyTracker(min_samples=5, min_timeout=1, max_timeout=30, multiplier=3)
+
+    def test_default_timeout_without_samples(self):
+        """Test timeout default dipakai selama sampel belum cukup"""
+        self.tracker.record(self.url, 0.5)
+        self.assertIsNone(self.tracker.percentile(self.url, 0.95))
+        self.assertEqual(self.tracker.timeout_for(self.url), 10)
+
+    def test_percentile_per_host(self):
+        """Test persentil dihitung per host"""
+        for seconds in [0.1, 0.2, 0.3, 0.4, 2.0]:
+            self.tracker.record(self.url, seconds)
+
+        self.assertEqual(self.tracker.percentile(self.url, 0.5), 0.3)
+        self.assertEqual(self.tracker.percentile(self.url, 0.95), 2.0)
+        self.assertIsNone(self.tracker.percentile("https://example.com/", 0.5))
+
+    def test_adaptive_timeout_clamped(self):
+        """Test timeout adaptif = p95 x multiplier dengan batas bawah"""
+        for _ in range(5):
+            self.tracker.record(self.url, 0.1)
+        self.assertEqual(self.tracker.timeout_for(self.url), 1)
+
+        for _ in range(5):
+            self.tracker.record(self.url, 2.0)
+        self.assertEqual(self.tracker.timeout_for(self.url), 6.0)
+
+    def test_timeouts_raise_next_timeout(self):
+        """Test timeout beruntun dicatat dan menggandakan timeout berikutnya"""
+        for _ in range(10):
+            self.tracker.record(self.url, 0.1)
+        self.assertEqual(self.tracker.timeout_for(self.url), 1)
+
+        self.tracker.record_timeout(self.url, 1)
+        self.assertEqual(self.tracker.timeout_for(self.url), 6)
+
+        self.tracker.record(self.url, 2.0)
+        self.assertEqual(self.tracker.timeout_for(self.url), 6.0)
+
+
+class TestHedgedFetcher(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        self.url = "https://fashion-studio.dicoding.dev/page2"
+        self.tracker = LatencyTracker(min_samples=1)
+        self.tracker.record(self.url, 0.05)
+
+    def tearDown(self):
+        """Cleanup setelah setiap test case"""
+        self.fetcher.close()
+
+    @patch('utils.latency.requests.get')
+    def test_hedge_wins_over_straggler(self, mock_get):
+        """Test request duplikat dikirim saat melewati p95 dan hasil tercepat dipakai"""
+        lambat = Mock(name='lambat')
+        cepat = Mock(name='cepat')
+        lepas = threading.Event()
+
+        def respons(url, timeout):
+            if mock_get.call_count == 1:
+                lepas.wait(2)
+                return lambat
+            return cepat
+
+        mock_get.side_effect = respons
+        self.fetcher = HedgedFetcher(self.tracker, hedge_budget=1)
+
+        result = self.fetcher.get(self.url)
+        lepas.set()
+
+        self.assertIs(result, cepat)
+        self.assertEqual(self.fetcher.hedges_used, 1)
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('utils.latency.requests.get')
+    def test_no_hedge_without_budget(self, mock_get):
+        """Test tidak ada request duplikat jika budget habis"""
+        response = Mock()
+
+        def respons(url, timeout):
+            time.sleep(0.2)
+            return response
+
+        mock_get.side_effect = respons
+        self.fetcher = HedgedFetcher(self.tracker, hedge_budget=0)
+
+        self.assertIs(self.fetcher.get(self.url), response)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('utils.latency.requests.get')
+    def test_recovers_when_host_gets_slower(self, mock_get):
+        """Test host yang melambat tidak terkunci pada timeout lama yang terlalu kecil"""
+        tracker = LatencyTracker(min_samples=5, min_timeout=1, max_timeout=30, multiplier=3)
+        for _ in range(10):
+            tracker.record(self.url, 0.1)
+        response = Mock()
+
+        def respons(url, timeout):
+            # Host sekarang butuh 2 detik per halaman
+            if timeout < 2:
+                raise requests.exceptions.ReadTimeout("Read timed out")
+            return response
+
+        mock_get.side_effect = respons
+        self.fetcher = HedgedFetcher(tracker, hedge_budget=0)
+
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.fetcher.get(self.url)
+        self.assertIs(self.fetcher.get(self.url), response)
+        self.assertGreaterEqual(tracker.timeout_for(self.url), 2)
+
+    @patch('utils.latency.requests.get')
+    def test_error_raised_when_all_fail(self, mock_get):
+        """Test RequestException diteruskan jika semua request gagal"""
+        mock_get.side_effect = requests.exceptions.Timeout("Request timeout")
+        self.fetcher = HedgedFetcher(self.tracker, hedge_budget=1)
+
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.fetcher.get(self.url)
+
+    @patch('utils.latency.requests.get')
+    def test_hedged_timeout_counted_once(self, mock_get):
+        """Test request asli dan hedge yang sama-sama timeout hanya dihitung satu kali"""
+        tracker = LatencyTracker(min_samples=5, min_timeout=1, max_timeout=30, multiplier=3)
+        for _ in range(10):
+            tracker.record(self.url, 0.1)
+
+        def respons(url, timeout):
+            time.sleep(0.2)
+            raise requests.exceptions.ReadTimeout("Read timed out")
+
+        mock_get.side_effect = respons
+        self.fetcher = HedgedFetcher(tracker, hedge_budget=1)
+
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.fetcher.get(self.url)
+
+        self.assertEqual(mock_get.call_count, 2)
+        # p95 menjadi 1 detik (x3), digandakan sekali; jika dihitung dua kali hasilnya 12
+        self.assertEqual(tracker.timeout_for(self.url), 6)
+
+    def test_shared_budget(self):
+        """Test budget bersama dipakai sebagai pengganti hitungan lokal"""
+        sisa = [1]
+
+        def take_budget():
+            if sisa[0] == 0:
+                return False
+            sisa[0] -= 1
+            return True
+
+        self.fetcher = HedgedFetcher(self.tracker, hedge_budget=5, take_budget=take_budget)
+
+        self.assertTrue(self.fetcher._take_budget())
+        self.assertFalse(self.fetcher._take_budget())
+        self.assertEqual(self.fetcher.hedges_used, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
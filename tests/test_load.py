@@ -4,7 +4,14 @@ import os
 import tempfile
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from utils.load import save_data_csv
+from utils.load import save_data_csv, save_data_sqlite, register_sink, load_to_sinks, SINKS
+from utils.load import upload_google_sheets_batch, iter_sheet_chunks, SinkSkipped
+import json
+import re
+import threading
+import numpy as np
+import sqlite3
+import time
 from unittest.mock import patch, MagicMock
 
 
@@ -235,5 +242,301 @@ class TestSaveDataCSV(unittest.TestCase):
         self.assertTrue(os.path.exists(no_ext_file))
 
 
+class TestLoadToSinks(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        SINKS.clear()
+        self.df = pd.DataFrame({'title': ['Product 1', 'Product 2'], 'price': [50.0, 75.5]})
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup setelah setiap test case"""
+        SINKS.clear()
+        for file in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, file))
+        os.rmdir(self.temp_dir)
+
+    def test_sinks_run_concurrently(self):
+        """Test total waktu load mengikuti sink paling lambat, bukan jumlahnya"""
+        register_sink('lambat_1', lambda df: time.sleep(0.3))
+        register_sink('lambat_2', lambda df: time.sleep(0.3))
+
+        start = time.perf_counter()
+        hasil = load_to_sinks(self.df)
+        durasi = time.perf_counter() - start
+
+        self.assertTrue(all(result.ok for result in hasil.values()))
+        self.assertLess(durasi, 0.55)
+
+    def test_sink_retry_then_success(self):
+        """Test sink dicoba ulang sesuai kebijakan retry"""
+        mock_func = MagicMock(side_effect=[Exception("Quota exceeded"), None])
+        register_sink('sheets', mock_func, retries=2, backoff=0)
+
+        hasil = load_to_sinks(self.df)
+
+        self.assertTrue(hasil['sheets'].ok)
+        self.assertEqual(hasil['sheets'].attempts, 2)
+
+    def test_sink_failure_reported(self):
+        """Test kegagalan satu sink tidak menghentikan sink lain"""
+        csv_file = os.path.join(self.temp_dir, "products.csv")
+        register_sink('csv', save_data_csv, nama_file=csv_file)
+        register_sink('rusak', MagicMock(side_effect=Exception("Disk full")), retries=1, backoff=0)
+
+        with patch('builtins.print'):
+            hasil = load_to_sinks(self.df)
+
+        self.assertTrue(hasil['csv'].ok)
+        self.assertTrue(os.path.exists(csv_file))
+        self.assertFalse(hasil['rusak'].ok)
+        self.assertEqual(hasil['rusak'].attempts, 2)
+        self.assertIn("Disk full", hasil['rusak'].error)
+
+    def test_sink_timeout(self):
+        """Test sink yang melebihi timeout dianggap gagal"""
+        register_sink('lambat', lambda df: time.sleep(1), timeout=0.05)
+
+        with patch('builtins.print'):
+            hasil = load_to_sinks(self.df, ['lambat'])
+
+        self.assertFalse(hasil['lambat'].ok)
+        self.assertIn("batas waktu", hasil['lambat'].error)
+
+    def test_sink_timeout_not_retried(self):
+        """Test sink yang timeout tidak dicoba ulang selama percobaan sebelumnya masih berjalan"""
+        mock_func = MagicMock(side_effect=lambda df: time.sleep(0.3))
+        register_sink('lambat', mock_func, retries=2, timeout=0.05, backoff=0)
+
+        with patch('builtins.print'):
+            hasil = load_to_sinks(self.df)
+
+        self.assertEqual(mock_func.call_count, 1)
+        self.assertEqual(hasil['lambat'].attempts, 1)
+
+    def test_sink_skipped_not_retried(self):
+        """Test sink yang dilewati (mis. API.json tidak ada) tidak dicoba ulang"""
+        mock_func = MagicMock(side_effect=SinkSkipped("File API.json tidak ditemukan"))
+        register_sink('sheets', mock_func, retries=2, backoff=10)
+
+        with patch('builtins.print'):
+            hasil = load_to_sinks(self.df)
+
+        self.assertEqual(mock_func.call_count, 1)
+        self.assertTrue(hasil['sheets'].skipped)
+        self.assertFalse(hasil['sheets'].ok)
+
+    def test_unknown_sink_reported(self):
+        """Test nama sink yang tidak terdaftar dilaporkan sebagai gagal, sink lain tetap jalan"""
+        mock_func = MagicMock()
+        register_sink('csv', mock_func)
+
+        with patch('builtins.print') as mock_print:
+            hasil = load_to_sinks(self.df, ['csv', 'sheet'])
+
+        # Pelaporan diserahkan ke pemanggil agar status tidak tercetak dua kali
+        mock_print.assert_not_called()
+        mock_func.assert_called_once()
+        self.assertTrue(hasil['csv'].ok)
+        self.assertFalse(hasil['sheet'].ok)
+        self.assertIn("tidak terdaftar", hasil['sheet'].error)
+
+    def test_save_data_sqlite(self):
+        """Test sink SQLite menyimpan DataFrame ke tabel"""
+        db_path = os.path.join(self.temp_dir, "products.db")
+
+        with patch('builtins.print'):
+            save_data_sqlite(self.df, db_path)
+
+        conn = sqlite3.connect(db_path)
+        try:
+            loaded_df = pd.read_sql_query("SELECT * FROM products", conn)
+        finally:
+            conn.close()
+        pd.testing.assert_frame_equal(loaded_df, self.df)
+
+
+class FakeSheetsService:
+    """Pengganti lokal Google Sheets API yang menyimpan sel ke dict."""
+
+    def __init__(self, fail_ranges=()):
+        self.cells = {}
+        self.requests = []
+        self.fail_ranges = set(fail_ranges)
+        self.lock = threading.Lock()
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def update(self, spreadsheetId, range, valueInputOption, body):
+        service = self
+
+        class Request:
+            def execute(self):
+                # Pastikan body bisa diserialisasi seperti request sungguhan
+                json.dumps(body)
+                with service.lock:
+                    service.requests.append(range)
+                    if range in service.fail_ranges:
+                        raise Exception(f"Request terlalu besar: {range}")
+                    match = re.match(r"^.+!([A-Z]+)(\d+):([A-Z]+)(\d+)$", range)
+                    first_row = int(match.group(2))
+                    for offset, row in enumerate(body['values']):
+                        for col, value in enumerate(row):
+                            service.cells[(first_row + offset, col)] = value
+                return {}
+
+        return Request()
+
+    def grid(self, first_row, n_rows, n_cols):
+        return [
+            [self.cells.get((first_row + r, c)) for c in range(n_cols)]
+            for r in range(n_rows)
+        ]
+
+
+class TestUploadGoogleSheetsBatch(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        self.df = pd.DataFrame({
+            'title': [f'Product {i}' for i in range(10)],
+            'price': [float(i) * 16000 for i in range(10)],
+            'colors': list(range(10)),
+        })
+        self.expected = [list(self.df.columns)] + [
+            [f'Product {i}', float(i) * 16000, i] for i in range(10)
+        ]
+        self.temp_dir = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.temp_dir, "checkpoint.json")
+
+    def tearDown(self):
+        """Cleanup setelah setiap test case"""
+        for file in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, file))
+        os.rmdir(self.temp_dir)
+
+    def test_iter_sheet_chunks(self):
+        """Test chunk berisi header lalu data, dengan NaN menjadi sel kosong"""
+        df = pd.DataFrame({'title': ['A', 'B', 'C'], 'price': [1.0, np.nan, 3.0]})
+
+        chunks = list(iter_sheet_chunks(df, chunk_size=2))
+
+        self.assertEqual(chunks, [
+            (0, [['title', 'price'], ['A', 1.0]]),
+            (1, [['B', ''], ['C', 3.0]]),
+        ])
+
+    def test_batch_upload_sequential_ranges(self):
+        """Test upload per chunk dengan range A1 berurutan"""
+        service = FakeSheetsService()
+
+        with patch('builtins.print'):
+            uploaded = upload_google_sheets_batch(
+                self.df, 'sheet-id', 'Sheet1!B2', chunk_size=4, max_in_flight=2,
+                service_factory=lambda: service
+            )
+
+        self.assertEqual(uploaded, 3)
+        self.assertEqual(
+            sorted(service.requests),
+            ['Sheet1!B10:D12', 'Sheet1!B2:D5', 'Sheet1!B6:D9']
+        )
+        self.assertEqual(service.grid(2, 11, 3), self.expected)
+
+    def test_batch_upload_resume_from_checkpoint(self):
+        """Test upload dilanjutkan dari chunk terakhir yang diterima setelah gagal"""
+        gagal = FakeSheetsService(fail_ranges={'Sheet1!A5:C6'})
+
+        with self.assertRaises(Exception) as context:
+            upload_google_sheets_batch(
+                self.df, 'sheet-id', 'Sheet1!A1', chunk_size=2, max_in_flight=1,
+                retries=1, backoff=0, checkpoint_file=self.checkpoint, service_factory=lambda: gagal
+            )
+        self.assertIn("chunk 2", str(context.exception))
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f)['next_chunk'], 2)
+
+        service = FakeSheetsService()
+        service.cells.update(gagal.cells)
+        with patch('builtins.print'):
+            uploaded = upload_google_sheets_batch(
+                self.df, 'sheet-id', 'Sheet1!A1', chunk_size=2, max_in_flight=1,
+                checkpoint_file=self.checkpoint, service_factory=lambda: service
+            )
+
+        self.assertEqual(uploaded, 4)
+        self.assertNotIn('Sheet1!A1:C2', service.requests)
+        self.assertEqual(service.grid(1, 11, 3), self.expected)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_batch_upload_checkpoint_ignored_for_new_data(self):
+        """Test checkpoint dari run lain dengan bentuk data sama tidak dipakai"""
+        gagal = FakeSheetsService(fail_ranges={'Sheet1!A5:C6'})
+        with self.assertRaises(Exception):
+            upload_google_sheets_batch(
+                self.df, 'sheet-id', 'Sheet1!A1', chunk_size=2, max_in_flight=1,
+                retries=0, checkpoint_file=self.checkpoint, service_factory=lambda: gagal
+            )
+
+        df_baru = self.df.copy()
+        df_baru['title'] = [f'New {i}' for i in range(10)]
+        service = FakeSheetsService()
+        with patch('builtins.print'):
+            uploaded = upload_google_sheets_batch(
+                df_baru, 'sheet-id', 'Sheet1!A1', chunk_size=2, max_in_flight=1,
+                checkpoint_file=self.checkpoint, service_factory=lambda: service
+            )
+
+        self.assertEqual(uploaded, 6)
+        self.assertEqual([row[0] for row in service.grid(2, 10, 3)], list(df_baru['title']))
+
+    def test_batch_upload_checkpoint_ignored_for_reordered_rows(self):
+        """Test checkpoint tidak dipakai jika baris yang sama urutannya berubah"""
+        gagal = FakeSheetsService(fail_ranges={'Sheet1!A5:C6'})
+        with self.assertRaises(Exception):
+            upload_google_sheets_batch(
+                self.df, 'sheet-id', 'Sheet1!A1', chunk_size=2, max_in_flight=1,
+                retries=0, checkpoint_file=self.checkpoint, service_factory=lambda: gagal
+            )
+
+        df_terbalik = self.df.iloc[::-1].reset_index(drop=True)
+        service = FakeSheetsService()
+        with patch('builtins.print'):
+            uploaded = upload_google_sheets_batch(
+                df_terbalik, 'sheet-id', 'Sheet1!A1', chunk_size=2, max_in_flight=1,
+                checkpoint_file=self.checkpoint, service_factory=lambda: service
+            )
+
+        self.assertEqual(uploaded, 6)
+        self.assertEqual([row[0] for row in service.grid(2, 10, 3)], list(df_terbalik['title']))
+
+    @patch('utils.load.time.sleep')
+    def test_batch_upload_exponential_backoff(self, mock_sleep):
+        """Test chunk yang gagal dicoba ulang dengan jeda eksponensial"""
+        gagal = FakeSheetsService(fail_ranges={'Sheet1!A1:C11'})
+
+        with self.assertRaises(Exception):
+            upload_google_sheets_batch(
+                self.df, 'sheet-id', 'Sheet1!A1', chunk_size=20, retries=3, backoff=0.5,
+                service_factory=lambda: gagal
+            )
+
+        self.assertEqual(len(gagal.requests), 4)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [0.5, 1.0, 2.0])
+
+    def test_batch_upload_missing_key_file(self):
+        """Test error jika file kredensial tidak ada dan service tidak diberikan"""
+        with self.assertRaises(SinkSkipped):
+            upload_google_sheets_batch(
+                self.df, 'sheet-id', 'Sheet1!A1',
+                key_file=os.path.join(self.temp_dir, "API.json")
+            )
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+import unittest
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.profiling import StageProfiler
+
+
+def hitung_berat():
+    return sum(i * i for i in range(20000))
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup setelah setiap test case"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_disabled_profiler_no_output(self):
+        """Test profiler nonaktif tidak menulis file apa pun"""
+        profiler = StageProfiler(None)
+
+        with profiler.stage('extract'):
+            hitung_berat()
+
+        self.assertFalse(profiler.enabled)
+        self.assertIsNone(profiler.write_summary())
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_stage_outputs_and_summary(self):
+        """Test setiap tahap menghasilkan .prof, laporan alokasi, dan ringkasan"""
+        profiler = StageProfiler(self.temp_dir)
+
+        with profiler.stage('transform'):
+            data = [str(i) * 10 for i in range(1000)]
+            hitung_berat()
+        summary_path = profiler.write_summary()
+
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'transform.prof')))
+        with open(os.path.join(self.temp_dir, 'transform_alloc.txt')) as f:
+            self.assertIn("Peak memori", f.read())
+        with open(summary_path) as f:
+            summary = f.read()
+        self.assertIn("=== transform:", summary)
+        self.assertIn("hitung_berat", summary)
+
+    def test_stage_captures_worker_threads(self):
+        """Test fungsi yang berjalan di thread lain ikut tercatat"""
+        profiler = StageProfiler(self.temp_dir)
+
+        with patch('builtins.print'):
+            with profiler.stage('load'):
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    list(executor.map(lambda _: hitung_berat(), range(2)))
+
+        stats = pstats.Stats(os.path.join(self.temp_dir, 'load.prof'))
+        functions = [func[2] for func in stats.stats]
+        self.assertIn('hitung_berat', functions)
+
+    def test_thread_work_after_stage_not_counted(self):
+        """Test pekerjaan thread setelah tahap selesai tidak masuk ke profil tahap"""
+        profiler = StageProfiler(self.temp_dir)
+        mulai = threading.Event()
+        lanjut = threading.Event()
+
+        def pekerja():
+            mulai.set()
+            lanjut.wait(2)
+            hitung_berat()
+
+        with patch('builtins.print'):
+            with profiler.stage('extract'):
+                thread = threading.Thread(target=pekerja)
+                thread.start()
+                mulai.wait(2)
+        lanjut.set()
+        thread.join()
+
+        stats = pstats.Stats(os.path.join(self.temp_dir, 'extract.prof'))
+        functions = [func[2] for func in stats.stats]
+        self.assertNotIn('hitung_berat', functions)
+
+    def test_stage_written_on_exception(self):
+        """Test profil tetap disimpan meski tahap gagal"""
+        profiler = StageProfiler(self.temp_dir)
+
+        with patch('builtins.print'):
+            with self.assertRaises(ValueError):
+                with profiler.stage('extract'):
+                    raise ValueError("Gagal")
+
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'extract.prof')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,12 @@ from datetime import datetime
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from utils.transform import transform_data
+from utils.transform import transform_data, transform_pages, clean_partition
+from utils.cache import PartitionCache
+from unittest.mock import patch
+import shutil
+import sqlite3
+import tempfile
 
 
 class TestTransformData(unittest.TestCase):
@@ -274,5 +279,102 @@ class TestTransformData(unittest.TestCase):
         self.assertEqual(result['gender'].dtype, object)
 
 
+class TestTransformPages(unittest.TestCase):
+
+    def setUp(self):
+        """Setup untuk setiap test case"""
+        self.pages = [
+            ('page1', [
+                {'title': 'Product 1', 'price': '$50.00', 'rating': 'Rating: 4.5',
+                 'colors': 'Colors: 3', 'size': 'Size: M', 'gender': 'Gender: Men'},
+                {'title': 'Unknown Title', 'price': '$10.00', 'rating': 'Rating: 4.0',
+                 'colors': 'Colors: 1', 'size': 'Size: S', 'gender': 'Gender: Men'},
+            ]),
+            ('page2', [
+                {'title': 'Product 1', 'price': '$50.00', 'rating': 'Rating: 4.5',
+                 'colors': 'Colors: 3', 'size': 'Size: M', 'gender': 'Gender: Men'},
+                {'title': 'Product 2', 'price': '$75.50', 'rating': 'Rating: 4.2',
+                 'colors': 'Colors: 2', 'size': 'Size: L', 'gender': 'Gender: Women'},
+            ]),
+        ]
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = PartitionCache(os.path.join(self.temp_dir, "transform.db"))
+
+    def tearDown(self):
+        """Cleanup setelah setiap test case"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_transform_pages_matches_transform_data(self):
+        """Test hasil per halaman sama dengan transform seluruh data, termasuk dedup lintas halaman"""
+        semua = [produk for _, daftar in self.pages for produk in daftar]
+        expected = transform_data(semua).drop(columns='timestamp').reset_index(drop=True)
+
+        result = transform_pages(self.pages).drop(columns='timestamp').reset_index(drop=True)
+
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(len(result), 2)
+
+    def test_transform_pages_empty(self):
+        """Test halaman kosong menghasilkan DataFrame kosong dengan kolom lengkap"""
+        result = transform_pages([('page1', [])])
+
+        self.assertTrue(result.empty)
+        self.assertIn('timestamp', result.columns)
+
+    def test_transform_pages_only_changed_pages(self):
+        """Test hanya halaman yang kontennya berubah yang ditransform ulang"""
+        with patch('builtins.print'):
+            first = transform_pages(self.pages, cache=self.cache)
+
+        self.pages[1][1][1]['price'] = '$80.00'
+        with patch('builtins.print'), \
+                patch('utils.transform.clean_partition', wraps=clean_partition) as mock_clean:
+            second = transform_pages(self.pages, cache=self.cache)
+
+        self.assertEqual(mock_clean.call_count, 1)
+        self.assertEqual(len(second), len(first))
+        self.assertEqual(second[second['title'] == 'Product 2'].iloc[0]['price'], 80.00 * 16000)
+
+    def test_transform_pages_version_invalidates_cache(self):
+        """Test perubahan TRANSFORM_VERSION membuat partisi lama tidak dipakai"""
+        with patch('builtins.print'):
+            transform_pages(self.pages, cache=self.cache)
+
+        with patch('builtins.print'), \
+                patch('utils.transform.TRANSFORM_VERSION', 2), \
+                patch('utils.transform.clean_partition', wraps=clean_partition) as mock_clean:
+            transform_pages(self.pages, cache=self.cache)
+
+        self.assertEqual(mock_clean.call_count, 2)
+
+    def test_transform_pages_cache_error_fallback(self):
+        """Test cache transform yang rusak tidak menggagalkan transform, semua halaman diproses"""
+        with open(self.cache.db_path, 'wb') as f:
+            f.write(b"bukan database sqlite" * 100)
+
+        with patch('builtins.print'), \
+                patch('utils.transform.clean_partition', wraps=clean_partition) as mock_clean:
+            result = transform_pages(self.pages, cache=self.cache)
+
+        expected = transform_pages(self.pages)
+        self.assertEqual(mock_clean.call_count, 2)
+        self.assertEqual(len(result), len(expected))
+
+    def test_transform_pages_unreadable_partition(self):
+        """Test partisi tersimpan yang tidak bisa dibaca ditransform ulang lalu ditimpa"""
+        with patch('builtins.print'):
+            transform_pages(self.pages, cache=self.cache)
+        with sqlite3.connect(self.cache.db_path) as conn:
+            conn.execute("UPDATE transform_cache SET partition = ? WHERE url = 'page1'", (b"\x80\x04pickle",))
+        conn.close()
+
+        with patch('builtins.print'), \
+                patch('utils.transform.clean_partition', wraps=clean_partition) as mock_clean:
+            transform_pages(self.pages, cache=self.cache)
+            transform_pages(self.pages, cache=self.cache)
+
+        self.assertEqual(mock_clean.call_count, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,161 @@
+import hashlib
+import io
+import json
+import sqlite3
+import time
+from contextlib import closing
+
+import pandas as pd
+
+
+def hash_html(html):
+    """Hash SHA-1 dari potongan HTML sebuah card produk."""
+    return hashlib.sha1(html.encode('utf-8')).hexdigest()
+
+
+def fingerprint_records(records):
+    """Fingerprint SHA-1 dari daftar record mentah hasil scraping satu halaman."""
+    return hash_html(json.dumps(records, sort_keys=True))
+
+
+class CardCache:
+    """Cache persisten (SQLite) dari hash HTML ``collection-card`` ke record hasil ekstraksi.
+
+    Menggunakan eviction LRU: jika jumlah entri melebihi ``max_entries``, entri yang
+    paling lama tidak dipakai akan dihapus.
+    """
+
+    def __init__(self, db_path="card_cache.db", max_entries=50000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        with closing(self._connect()) as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS card_cache (
+                    key TEXT PRIMARY KEY,
+                    record TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_card_cache_last_used
+                    ON card_cache (last_used);
+                """
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        # WAL agar beberapa proses worker bisa membaca sambil ada yang menulis
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get_many(self, keys):
+        """Ambil record untuk daftar hash. Mengembalikan dict hash -> record untuk yang ada."""
+        keys = list(set(keys))
+        if not keys:
+            return {}
+
+        hasil = {}
+        with closing(self._connect()) as conn, conn:
+            # Batasi jumlah parameter per query agar aman untuk batas variabel SQLite
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, record FROM card_cache WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                hasil.update((key, json.loads(record)) for key, record in rows)
+
+            if hasil:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE card_cache SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in hasil]
+                )
+        return hasil
+
+    def put_many(self, items):
+        """Simpan pasangan (hash, record) lalu lakukan eviction LRU jika melebihi batas."""
+        if not items:
+            return
+
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO card_cache (key, record, last_used) VALUES (?, ?, ?)",
+                [(key, json.dumps(record), now) for key, record in items]
+            )
+            conn.execute(
+                """
+                DELETE FROM card_cache WHERE key IN (
+                    SELECT key FROM card_cache ORDER BY last_used DESC, rowid DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM card_cache").fetchone()[0]
+
+
+class PartitionCache:
+    """Cache persisten (SQLite) dari partisi DataFrame hasil transform per halaman.
+
+    Setiap URL menyimpan fingerprint konten mentahnya; partisi hanya dipakai ulang
+    jika fingerprint halaman pada run berikutnya masih sama. Partisi disimpan sebagai
+    JSON (orient ``table``) yang tetap terbaca setelah upgrade pandas; baris yang
+    tidak bisa dibaca dianggap tidak ada di cache.
+    """
+
+    def __init__(self, db_path="transform_cache.db"):
+        self.db_path = db_path
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS transform_cache (
+                    url TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    partition TEXT NOT NULL
+                )
+                """
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get_many(self, fingerprints):
+        """Ambil partisi untuk dict URL -> fingerprint. Hanya yang fingerprint-nya cocok."""
+        if not fingerprints:
+            return {}
+
+        hasil = {}
+        urls = list(fingerprints)
+        with closing(self._connect()) as conn:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT url, fingerprint, partition FROM transform_cache "
+                    f"WHERE url IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for url, fingerprint, partition in rows:
+                    if fingerprints[url] != fingerprint:
+                        continue
+                    try:
+                        hasil[url] = pd.read_json(io.StringIO(partition), orient='table')
+                    except (TypeError, ValueError):
+                        # Format lama atau rusak; halaman ini ditransform ulang dan ditimpa
+                        continue
+        return hasil
+
+    def put_many(self, items):
+        """Simpan daftar (url, fingerprint, partisi DataFrame), menimpa versi lama."""
+        if not items:
+            return
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO transform_cache (url, fingerprint, partition) VALUES (?, ?, ?)",
+                [(url, fingerprint, df.to_json(orient='table')) for url, fingerprint, df in items]
+            )
@@ -0,0 +1,271 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+import time
+from contextlib import closing
+from functools import partial
+
+from utils.cache import CardCache
+from utils.extract import scrape_product
+from utils.latency import HedgedFetcher
+
+# Nama baris budget hedged request bersama di tabel budgets
+HEDGE_BUDGET = 'hedge'
+
+
+class JobQueue:
+    """Antrean job scraping berbasis SQLite yang bisa dipakai bersama oleh banyak proses.
+
+    Setiap URL halaman adalah satu job. Worker mengambil job dengan sistem lease:
+    jika worker mati sebelum menyelesaikan job, lease akan kedaluwarsa dan job
+    dikembalikan ke antrean sampai batas ``max_attempts`` tercapai.
+    """
+
+    def __init__(self, db_path="crawl_queue.db", lease_timeout=60, max_attempts=3):
+        self.db_path = db_path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT UNIQUE NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    lease_until REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS budgets (
+                    name TEXT PRIMARY KEY,
+                    remaining INTEGER NOT NULL
+                )
+                """
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def reset(self):
+        """Hapus semua job dan budget bersama dari antrean."""
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM jobs")
+            conn.execute("DELETE FROM budgets")
+
+    def set_budget(self, name, jumlah):
+        """Atur sisa budget bersama (mis. hedged request) untuk semua worker."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO budgets (name, remaining) VALUES (?, ?)",
+                (name, jumlah)
+            )
+
+    def take_budget(self, name):
+        """Ambil satu unit budget bersama. Mengembalikan False jika budget habis."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "UPDATE budgets SET remaining = remaining - 1 WHERE name = ? AND remaining > 0",
+                (name,)
+            )
+            conn.execute("COMMIT")
+            return cursor.rowcount == 1
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def enqueue(self, urls):
+        """Tambahkan URL ke antrean. URL yang sudah ada tidak diduplikasi."""
+        with closing(self._connect()) as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (url) VALUES (?)",
+                [(url,) for url in urls]
+            )
+
+    def _requeue_expired(self, conn, now):
+        conn.execute(
+            """
+            UPDATE jobs SET status = 'failed', worker = NULL, lease_until = NULL,
+                error = 'Lease kedaluwarsa, batas percobaan tercapai'
+            WHERE status = 'leased' AND lease_until < ? AND attempts >= ?
+            """,
+            (now, self.max_attempts)
+        )
+        conn.execute(
+            """
+            UPDATE jobs SET status = 'pending', worker = NULL, lease_until = NULL
+            WHERE status = 'leased' AND lease_until < ?
+            """,
+            (now,)
+        )
+
+    def lease(self, worker_id):
+        """Ambil satu job pending untuk worker. Mengembalikan URL atau None jika kosong."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT id, url FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'leased', worker = ?, lease_until = ?,
+                    attempts = attempts + 1
+                WHERE id = ?
+                """,
+                (worker_id, now + self.lease_timeout, row[0])
+            )
+            conn.execute("COMMIT")
+            return row[1]
+        except Exception:
+            # BEGIN IMMEDIATE sendiri bisa gagal (database terkunci); jangan tutupi error aslinya
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def complete(self, url, worker_id, produk):
+        """Simpan hasil scraping untuk job yang masih di-lease oleh worker ini."""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_until = NULL
+                WHERE url = ? AND worker = ? AND status = 'leased'
+                """,
+                (json.dumps(produk), url, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, url, worker_id, error):
+        """Catat kegagalan job. Job dikembalikan ke antrean selama masih ada sisa percobaan."""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET
+                    status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    worker = NULL, lease_until = NULL, error = ?
+                WHERE url = ? AND worker = ? AND status = 'leased'
+                """,
+                (self.max_attempts, str(error), url, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def is_done(self):
+        """True jika tidak ada lagi job pending maupun yang sedang di-lease."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')"
+            ).fetchone()
+        return row[0] == 0
+
+    def page_results(self):
+        """Hasil per halaman sebagai daftar (url, daftar produk) sesuai urutan antrean."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT url, result FROM jobs WHERE status = 'done' ORDER BY id"
+            ).fetchall()
+        return [(url, json.loads(result)) for url, result in rows]
+
+    def failures(self):
+        """Kembalikan dict URL -> pesan error untuk job yang gagal permanen."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT url, error FROM jobs WHERE status = 'failed' ORDER BY id"
+            ).fetchall()
+        return dict(rows)
+
+
+def run_worker(db_path, worker_id, lease_timeout=60, max_attempts=3, poll_interval=0.5,
+               cache_path=None, hedge_budget=None):
+    """Loop worker: ambil URL dari antrean, scrape, lalu kirim hasilnya kembali.
+
+    Jika ``hedge_budget`` diberikan, worker memakai HedgedFetcher sendiri dengan
+    timeout adaptif; hedged request diambil dari budget bersama di antrean, sehingga
+    batasnya berlaku untuk semua worker sekaligus.
+    """
+    queue = JobQueue(db_path, lease_timeout=lease_timeout, max_attempts=max_attempts)
+    cache = CardCache(cache_path) if cache_path else None
+    fetcher = None
+    if hedge_budget is not None:
+        fetcher = HedgedFetcher(hedge_budget=hedge_budget,
+                                take_budget=partial(queue.take_budget, HEDGE_BUDGET))
+    try:
+        _worker_loop(queue, worker_id, poll_interval, cache, fetcher)
+    finally:
+        if fetcher is not None:
+            fetcher.close()
+
+
+def _worker_loop(queue, worker_id, poll_interval, cache, fetcher):
+    while True:
+        url = queue.lease(worker_id)
+        if url is None:
+            if queue.is_done():
+                break
+            time.sleep(poll_interval)
+            continue
+
+        try:
+            produk = scrape_product(url, cache=cache, fetcher=fetcher)
+        except Exception as e:
+            print(f"❌ [{worker_id}] Gagal scraping {url}: {e}")
+            queue.fail(url, worker_id, e)
+            continue
+
+        queue.complete(url, worker_id, produk)
+
+
+def scrape_distributed(urls, jumlah_worker=4, db_path="crawl_queue.db",
+                       lease_timeout=60, max_attempts=3, cache_path=None, hedge_budget=None):
+    """Scrape daftar URL memakai beberapa proses worker yang berbagi antrean SQLite.
+
+    Mengembalikan daftar (url, daftar produk) per halaman yang berhasil.
+    """
+    queue = JobQueue(db_path, lease_timeout=lease_timeout, max_attempts=max_attempts)
+    queue.reset()
+    queue.enqueue(urls)
+    if hedge_budget is not None:
+        queue.set_budget(HEDGE_BUDGET, hedge_budget)
+
+    workers = []
+    for i in range(jumlah_worker):
+        proses = multiprocessing.Process(
+            target=run_worker,
+            args=(db_path, f"worker-{os.getpid()}-{i}", lease_timeout, max_attempts),
+            kwargs={'cache_path': cache_path, 'hedge_budget': hedge_budget}
+        )
+        proses.start()
+        workers.append(proses)
+
+    for proses in workers:
+        proses.join()
+
+    if not queue.is_done():
+        # Ada worker yang mati sambil memegang lease; selesaikan sisanya di proses ini.
+        run_worker(db_path, f"coordinator-{os.getpid()}", lease_timeout, max_attempts,
+                   cache_path=cache_path, hedge_budget=hedge_budget)
+
+    for url, error in queue.failures().items():
+        print(f"❌ Gagal scraping {url}: {error}")
+
+    return queue.page_results()
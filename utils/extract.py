@@ -1,39 +1,80 @@
+import sqlite3
 import requests
 from bs4 import BeautifulSoup
+from utils.cache import hash_html
+
+# Naikkan setiap kali logika extract_card berubah (field baru, nilai default), agar
+# record lama di CardCache tidak dipakai lagi.
+EXTRACT_VERSION = 1
+
+
+def extract_card(card) -> dict:
+    """Ekstrak field produk dari satu elemen ``collection-card``."""
+    title = card.find('h3', class_='product-title')
+    price = card.find('div', class_='price-container')
+    rating = card.find('p', string=lambda t: t and 'Rating' in t)
+    colors = card.find('p', string=lambda t: t and 'Colors' in t)
+    size = card.find('p', string=lambda t: t and 'Size' in t)
+    gender = card.find('p', string=lambda t: t and 'Gender' in t)
+
+    return {
+        'title': title.text.strip() if title else 'Unknown Title',
+        'price': price.text.strip() if price else 'Price Not Available',
+        'rating': rating.text.strip() if rating else 'No Rating',
+        'colors': colors.text.strip() if colors else 'No Color Info',
+        'size': size.text.strip() if size else 'No Size Info',
+        'gender': gender.text.strip() if gender else 'No Gender Info',
+    }
+
+
+def _extract_with_cache(cards, cache) -> list:
+    """Ekstrak card memakai CardCache. Cache hanya optimasi: error SQLite tidak menggagalkan halaman."""
+    keys = [f"v{EXTRACT_VERSION}:{hash_html(str(card))}" for card in cards]
+    try:
+        cached = cache.get_many(keys)
+    except sqlite3.Error as e:
+        print(f"⚠️ Cache card tidak bisa dibaca, ekstraksi tanpa cache: {e}")
+        cached = {}
+
+    baru = {}
+    for key, card in zip(keys, cards):
+        if key not in cached and key not in baru:
+            baru[key] = extract_card(card)
 
-def scrape_product(url) -> list:
     try:
-        response = requests.get(url, timeout=10)
+        cache.put_many(list(baru.items()))
+    except sqlite3.Error as e:
+        print(f"⚠️ Cache card tidak bisa disimpan: {e}")
+
+    return [cached[key] if key in cached else baru[key] for key in keys]
+
+
+def scrape_product(url, cache=None, fetcher=None) -> list:
+    """Scrape semua card produk dari satu halaman.
+
+    Jika ``cache`` (CardCache) diberikan, card yang HTML-nya tidak berubah
+    diambil dari cache tanpa ekstraksi ulang. Jika ``fetcher`` (HedgedFetcher)
+    diberikan, halaman diambil dengan timeout adaptif dan hedged request.
+    """
+    try:
+        if fetcher is None:
+            response = requests.get(url, timeout=10)
+        else:
+            response = fetcher.get(url)
         response.raise_for_status()
     except requests.exceptions.RequestException as err:
         raise Exception(f"Gagal mengakses {url}: {err}")
 
     try:
         soup = BeautifulSoup(response.text, 'html.parser')
-        produk_list = []
-
         cards = soup.find_all('div', class_='collection-card')
         if not cards:
             print(f"Tidak ada produk ditemukan di halaman {url}")
 
-        for card in cards:
-            title = card.find('h3', class_='product-title')
-            price = card.find('div', class_='price-container')
-            rating = card.find('p', string=lambda t: t and 'Rating' in t)
-            colors = card.find('p', string=lambda t: t and 'Colors' in t)
-            size = card.find('p', string=lambda t: t and 'Size' in t)
-            gender = card.find('p', string=lambda t: t and 'Gender' in t)
-
-            produk = {
-                'title': title.text.strip() if title else 'Unknown Title',
-                'price': price.text.strip() if price else 'Price Not Available',
-                'rating': rating.text.strip() if rating else 'No Rating',
-                'colors': colors.text.strip() if colors else 'No Color Info',
-                'size': size.text.strip() if size else 'No Size Info',
-                'gender': gender.text.strip() if gender else 'No Gender Info',
-            }
-
-            produk_list.append(produk)
+        if cache is None:
+            produk_list = [extract_card(card) for card in cards]
+        else:
+            produk_list = _extract_with_cache(cards, cache)
 
         print(f"{len(produk_list)} produk berhasil diambil dari {url}")
         return produk_list
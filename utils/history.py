@@ -0,0 +1,142 @@
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+
+class PriceHistory:
+    """Penyimpanan riwayat harga/rating per produk berbasis SQLite (append-only).
+
+    Setiap observasi disimpan di tabel ``observations`` dengan indeks (title, timestamp).
+    Rollup harian (min/max/rata-rata harga, rating awal/akhir) diperbarui saat append,
+    sehingga query tren dan penurunan harga tidak perlu memindai seluruh riwayat.
+    """
+
+    def __init__(self, db_path="price_history.db"):
+        self.db_path = db_path
+        with closing(self._connect()) as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS observations (
+                    title TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    rating REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_observations_title_ts
+                    ON observations (title, timestamp);
+                CREATE TABLE IF NOT EXISTS daily_rollup (
+                    title TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    min_price REAL NOT NULL,
+                    max_price REAL NOT NULL,
+                    sum_price REAL NOT NULL,
+                    n_obs INTEGER NOT NULL,
+                    first_ts TEXT NOT NULL,
+                    first_rating REAL NOT NULL,
+                    last_ts TEXT NOT NULL,
+                    last_rating REAL NOT NULL,
+                    PRIMARY KEY (title, day)
+                );
+                CREATE INDEX IF NOT EXISTS idx_daily_rollup_day ON daily_rollup (day);
+                """
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def append(self, df):
+        """Tambahkan observasi dari DataFrame hasil transform_data ke riwayat."""
+        if df.empty:
+            return 0
+
+        obs = df[['title', 'timestamp', 'price', 'rating']].copy()
+        obs['price'] = obs['price'].astype(float)
+        obs['rating'] = obs['rating'].astype(float)
+        obs['day'] = obs['timestamp'].str.slice(0, 10)
+        obs = obs.sort_values('timestamp', kind='stable')
+
+        grouped = obs.groupby(['title', 'day'], sort=False)
+        rollup = grouped.agg(
+            min_price=('price', 'min'),
+            max_price=('price', 'max'),
+            sum_price=('price', 'sum'),
+            n_obs=('price', 'size'),
+            first_ts=('timestamp', 'first'),
+            first_rating=('rating', 'first'),
+            last_ts=('timestamp', 'last'),
+            last_rating=('rating', 'last'),
+        ).reset_index()
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO observations (title, timestamp, price, rating) VALUES (?, ?, ?, ?)",
+                obs[['title', 'timestamp', 'price', 'rating']].itertuples(index=False, name=None)
+            )
+            conn.executemany(
+                """
+                INSERT INTO daily_rollup (title, day, min_price, max_price, sum_price, n_obs,
+                                          first_ts, first_rating, last_ts, last_rating)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (title, day) DO UPDATE SET
+                    min_price = MIN(min_price, excluded.min_price),
+                    max_price = MAX(max_price, excluded.max_price),
+                    sum_price = sum_price + excluded.sum_price,
+                    n_obs = n_obs + excluded.n_obs,
+                    first_rating = CASE WHEN excluded.first_ts < first_ts
+                                        THEN excluded.first_rating ELSE first_rating END,
+                    first_ts = MIN(first_ts, excluded.first_ts),
+                    last_rating = CASE WHEN excluded.last_ts >= last_ts
+                                       THEN excluded.last_rating ELSE last_rating END,
+                    last_ts = MAX(last_ts, excluded.last_ts)
+                """,
+                rollup[[
+                    'title', 'day', 'min_price', 'max_price', 'sum_price', 'n_obs',
+                    'first_ts', 'first_rating', 'last_ts', 'last_rating'
+                ]].itertuples(index=False, name=None)
+            )
+        return len(obs)
+
+    def price_trend(self, title, start_day=None, end_day=None):
+        """Tren harga harian untuk satu produk, diambil dari rollup harian."""
+        query = """
+            SELECT day, min_price, max_price, sum_price / n_obs AS avg_price,
+                   first_rating, last_rating, last_rating - first_rating AS rating_change
+            FROM daily_rollup
+            WHERE title = ? AND day >= ? AND day <= ?
+            ORDER BY day
+        """
+        params = (title, start_day or '0000-00-00', end_day or '9999-99-99')
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def biggest_price_drops(self, days=7, limit=10, today=None):
+        """Produk dengan penurunan harga rata-rata harian terbesar dalam ``days`` hari terakhir."""
+        today = today or datetime.now()
+        since = (today - timedelta(days=days)).strftime('%Y-%m-%d')
+        query = """
+            WITH daily_window AS (
+                SELECT title, day, sum_price / n_obs AS avg_price,
+                       ROW_NUMBER() OVER (PARTITION BY title ORDER BY day) AS rn_first,
+                       ROW_NUMBER() OVER (PARTITION BY title ORDER BY day DESC) AS rn_last
+                FROM daily_rollup
+                WHERE day >= ?
+            )
+            SELECT f.title, f.day AS start_day, f.avg_price AS start_price,
+                   l.day AS end_day, l.avg_price AS end_price,
+                   f.avg_price - l.avg_price AS price_drop
+            FROM daily_window f
+            JOIN daily_window l ON l.title = f.title AND l.rn_last = 1
+            WHERE f.rn_first = 1 AND f.avg_price > l.avg_price
+            ORDER BY price_drop DESC
+            LIMIT ?
+        """
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(query, conn, params=(since, limit))
+
+
+def save_price_history(df, db_path="price_history.db"):
+    """Tambahkan hasil run ke riwayat harga. Dipakai sebagai sink ``history``."""
+    jumlah = PriceHistory(db_path).append(df)
+    print(f"✅ {jumlah} observasi ditambahkan ke riwayat harga {db_path}")
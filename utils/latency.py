@@ -0,0 +1,132 @@
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
+
+import requests
+
+
+class LatencyTracker:
+    """Catat latensi request per host dan turunkan timeout adaptif dari p95.
+
+    Selama sampel untuk sebuah host belum mencapai ``min_samples``, timeout
+    memakai ``default_timeout`` (sama dengan timeout tetap sebelumnya).
+    Request yang timeout dicatat sebagai sampel seharga timeout-nya dan setiap
+    timeout beruntun menggandakan timeout berikutnya, sehingga host yang
+    melambat tidak terkunci pada timeout lama.
+    """
+
+    def __init__(self, window=200, min_samples=5, default_timeout=10,
+                 min_timeout=1, max_timeout=30, multiplier=3):
+        self.min_samples = min_samples
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.multiplier = multiplier
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._timeouts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, url, seconds):
+        """Catat durasi satu request yang berhasil."""
+        host = urlparse(url).netloc
+        with self._lock:
+            self._samples[host].append(seconds)
+            self._timeouts[host] = 0
+
+    def record_timeout(self, url, timeout):
+        """Catat request yang timeout sebagai sampel minimal ``timeout`` detik."""
+        host = urlparse(url).netloc
+        with self._lock:
+            self._samples[host].append(timeout)
+            self._timeouts[host] += 1
+
+    def percentile(self, url, q):
+        """Persentil ``q`` (0-1) latensi host, atau None jika sampel belum cukup."""
+        with self._lock:
+            samples = sorted(self._samples[urlparse(url).netloc])
+        if len(samples) < self.min_samples:
+            return None
+        index = max(0, math.ceil(q * len(samples)) - 1)
+        return samples[index]
+
+    def timeout_for(self, url):
+        """Timeout adaptif: p95 dikali ``multiplier``, digandakan per timeout beruntun,
+        lalu dibatasi min/max timeout."""
+        p95 = self.percentile(url, 0.95)
+        base = self.default_timeout if p95 is None else p95 * self.multiplier
+        with self._lock:
+            backoff = 2 ** self._timeouts[urlparse(url).netloc]
+        return min(self.max_timeout, max(self.min_timeout, base * backoff))
+
+
+class HedgedFetcher:
+    """Fetch halaman dengan timeout adaptif dan hedged request opsional.
+
+    Jika request belum selesai setelah melewati p95 host, request duplikat
+    dikirim dan hasil yang pertama selesai dipakai. Jumlah request duplikat
+    dibatasi ``hedge_budget`` untuk seluruh run (0 menonaktifkan hedging).
+    Jika ``take_budget`` diberikan (mis. dari JobQueue yang dipakai bersama
+    beberapa proses), fungsi itu yang memutuskan apakah budget masih tersisa.
+    """
+
+    def __init__(self, tracker=None, hedge_budget=10, max_workers=4, take_budget=None):
+        self.tracker = tracker or LatencyTracker()
+        self.hedge_budget = hedge_budget
+        self.hedges_used = 0
+        self._shared_budget = take_budget
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _take_budget(self):
+        with self._lock:
+            if self._shared_budget is not None:
+                if not self._shared_budget():
+                    return False
+            elif self.hedges_used >= self.hedge_budget:
+                return False
+            self.hedges_used += 1
+            return True
+
+    def _timed_get(self, url, timeout):
+        start = time.perf_counter()
+        response = requests.get(url, timeout=timeout)
+        response.raise_for_status()
+        self.tracker.record(url, time.perf_counter() - start)
+        return response
+
+    def get(self, url):
+        """Ambil URL. Melempar RequestException jika semua percobaan gagal."""
+        timeout = self.tracker.timeout_for(url)
+        pending = {self._executor.submit(self._timed_get, url, timeout)}
+
+        hedge_delay = self.tracker.percentile(url, 0.95)
+        if hedge_delay is not None and self.hedge_budget > 0:
+            done, pending = wait(pending, timeout=hedge_delay)
+            if not done and self._take_budget():
+                pending.add(self._executor.submit(self._timed_get, url, timeout))
+        else:
+            done = set()
+
+        error = None
+        timed_out = False
+        while True:
+            for future in done:
+                try:
+                    return future.result()
+                except requests.exceptions.Timeout as e:
+                    timed_out = True
+                    error = error or e
+                except requests.exceptions.RequestException as e:
+                    error = error or e
+            if not pending:
+                # Request asli dan hedge-nya dihitung sebagai satu timeout untuk halaman ini
+                if timed_out:
+                    self.tracker.record_timeout(url, timeout)
+                raise error
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -1,12 +1,208 @@
+import hashlib
+import json
 import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import closing
+from dataclasses import dataclass
+
 import pandas as pd
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 
+
+class SinkSkipped(Exception):
+    """Sink tidak bisa dijalankan (mis. kredensial tidak ada); dilewati tanpa retry."""
+
+
+class SinkTimeout(TimeoutError):
+    """Percobaan sink melebihi batas waktu dan thread-nya masih berjalan."""
+
+
 def save_data_csv(df, nama_file="products.csv"):
     """Simpan DataFrame ke file CSV."""
     df.to_csv(nama_file, index=False)
     print(f"✅ Data berhasil disimpan ke {nama_file}")
+
+def upload_google_sheets(df, spreadsheet_id, range_sheet, key_file='API.json'):
+    """Upload DataFrame ke Google Sheets. Melempar exception jika gagal."""
+    if not os.path.exists(key_file):
+        raise SinkSkipped(f"File {key_file} tidak ditemukan, lewati upload ke Google Sheets")
+
+    creds = Credentials.from_service_account_file(key_file)
+    service = build('sheets', 'v4', credentials=creds)
+    sheet = service.spreadsheets()
+
+    values = [df.columns.tolist()] + df.values.tolist()
+    body = {'values': values}
+
+    sheet.values().update(
+        spreadsheetId=spreadsheet_id,
+        range=range_sheet,
+        valueInputOption='RAW',
+        body=body
+    ).execute()
+    print(f"✅ Data berhasil disimpan di Google Sheets pada {range_sheet}")
+
+def _col_to_index(col):
+    index = 0
+    for char in col:
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index
+
+def _index_to_col(index):
+    col = ''
+    while index > 0:
+        index, sisa = divmod(index - 1, 26)
+        col = chr(ord('A') + sisa) + col
+    return col
+
+def _parse_a1(range_sheet):
+    """Pecah 'Sheet1!B2' menjadi ('Sheet1', 'B', 2)."""
+    match = re.match(r"^(?:(?P<sheet>.+)!)?(?P<col>[A-Z]+)(?P<row>\d+)", range_sheet)
+    if not match:
+        raise ValueError(f"Range A1 tidak valid: {range_sheet}")
+    return match.group('sheet'), match.group('col'), int(match.group('row'))
+
+def iter_sheet_chunks(df, chunk_size=1000, start_chunk=0):
+    """Hasilkan (nomor chunk, baris) berisi header lalu data, dibuat per blok kolom.
+
+    Tiap kolom diambil lewat ``Series.tolist()`` untuk potongan baris saja,
+    sehingga tidak ada salinan object 2D dari seluruh DataFrame.
+    """
+    header = [str(col) for col in df.columns]
+    total_rows = len(df) + 1
+
+    for chunk in range(start_chunk, (total_rows + chunk_size - 1) // chunk_size):
+        # Baris virtual 0 adalah header, baris data ke-i berada di baris virtual i + 1
+        start = max(0, chunk * chunk_size - 1)
+        end = min(len(df), (chunk + 1) * chunk_size - 1)
+        columns = []
+        for i in range(df.shape[1]):
+            column = df.iloc[start:end, i]
+            if column.hasnans:
+                # NaN tidak valid di JSON; kirim sebagai sel kosong
+                column = column.astype(object).where(column.notna(), '')
+            columns.append(column.tolist())
+        rows = [list(row) for row in zip(*columns)] if columns else [[] for _ in range(end - start)]
+        if chunk == 0:
+            rows.insert(0, header)
+        yield chunk, rows
+
+def _load_checkpoint(checkpoint_file, identitas):
+    if not checkpoint_file or not os.path.exists(checkpoint_file):
+        return 0
+    with open(checkpoint_file) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('identitas') != identitas:
+        return 0
+    return checkpoint.get('next_chunk', 0)
+
+def _save_checkpoint(checkpoint_file, identitas, next_chunk):
+    if not checkpoint_file:
+        return
+    tmp_file = f"{checkpoint_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump({'identitas': identitas, 'next_chunk': next_chunk}, f)
+    os.replace(tmp_file, checkpoint_file)
+
+def upload_google_sheets_batch(df, spreadsheet_id, range_sheet, chunk_size=1000, max_in_flight=4,
+                               retries=2, backoff=1.0, checkpoint_file=None, service_factory=None,
+                               key_file='API.json'):
+    """Upload DataFrame ke Google Sheets per chunk baris dengan range A1 berurutan.
+
+    Maksimal ``max_in_flight`` request berjalan bersamaan; chunk yang gagal dicoba
+    ulang hingga ``retries`` kali dengan jeda ``backoff * 2**percobaan`` detik.
+    Chunk terakhir yang berurutan dan sudah diterima dicatat di ``checkpoint_file``,
+    sehingga pemanggilan ulang dengan data yang sama melanjutkan dari chunk berikutnya.
+    ``service_factory`` membuat objek service Sheets (satu per thread, karena
+    klien googleapiclient tidak thread-safe); default memakai ``key_file``.
+    Mengembalikan jumlah chunk yang diupload pada pemanggilan ini.
+    """
+    if service_factory is None:
+        if not os.path.exists(key_file):
+            raise SinkSkipped(f"File {key_file} tidak ditemukan, lewati upload ke Google Sheets")
+        creds = Credentials.from_service_account_file(key_file)
+        service_factory = lambda: build('sheets', 'v4', credentials=creds)
+
+    sheet_name, start_col, start_row = _parse_a1(range_sheet)
+    prefix = f"{sheet_name}!" if sheet_name else ''
+    end_col = _index_to_col(_col_to_index(start_col) + max(df.shape[1], 1) - 1)
+
+    identitas = {
+        'spreadsheet_id': spreadsheet_id, 'range': range_sheet, 'chunk_size': chunk_size,
+        'rows': len(df), 'columns': [str(col) for col in df.columns],
+        # Isi dan urutan baris ikut dicek: data lain (atau baris yang ditukar) dengan bentuk
+        # sama tidak boleh melanjutkan checkpoint lama
+        'content_hash': hashlib.sha1(
+            pd.util.hash_pandas_object(df, index=False).values.tobytes()
+        ).hexdigest(),
+    }
+    next_chunk = _load_checkpoint(checkpoint_file, identitas)
+    lokal = threading.local()
+
+    def kirim(chunk, rows):
+        if not hasattr(lokal, 'sheet'):
+            lokal.sheet = service_factory().spreadsheets()
+        first_row = start_row + chunk * chunk_size
+        a1 = f"{prefix}{start_col}{first_row}:{end_col}{first_row + len(rows) - 1}"
+        for attempt in range(retries + 1):
+            try:
+                lokal.sheet.values().update(
+                    spreadsheetId=spreadsheet_id,
+                    range=a1,
+                    valueInputOption='RAW',
+                    body={'values': rows}
+                ).execute()
+                return
+            except Exception:
+                if attempt == retries:
+                    raise
+                # Jeda eksponensial agar error kuota/429 sempat pulih
+                time.sleep(backoff * 2 ** attempt)
+
+    acked = set()
+    uploaded = 0
+    chunks = iter_sheet_chunks(df, chunk_size, start_chunk=next_chunk)
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        in_flight = {}
+        error = None
+        while True:
+            while error is None and len(in_flight) < max_in_flight:
+                item = next(chunks, None)
+                if item is None:
+                    break
+                in_flight[executor.submit(kirim, *item)] = item[0]
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = in_flight.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                acked.add(chunk)
+                uploaded += 1
+
+            while next_chunk in acked:
+                acked.discard(next_chunk)
+                next_chunk += 1
+            _save_checkpoint(checkpoint_file, identitas, next_chunk)
+
+    if error is not None:
+        raise Exception(f"Upload berhenti, lanjutkan dari chunk {next_chunk}: {error}")
+
+    if checkpoint_file and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    print(f"✅ {uploaded} chunk berhasil disimpan di Google Sheets mulai {range_sheet}")
+    return uploaded
+
 def Save_data_google_sheets(df, spreadsheet_id, range_sheet):
     """Simpan DataFrame ke Google Sheets."""
     if not os.path.exists('API.json'):
@@ -14,20 +210,111 @@ def Save_data_google_sheets(df, spreadsheet_id, range_sheet):
         return
 
     try:
-        creds = Credentials.from_service_account_file('API.json')
-        service = build('sheets', 'v4', credentials=creds)
-        sheet = service.spreadsheets()
+        upload_google_sheets(df, spreadsheet_id, range_sheet)
+    except Exception as e:
+        print(f"❌ Gagal simpan ke Google Sheets: {e}")
 
-        values = [df.columns.tolist()] + df.values.tolist()
-        body = {'values': values}
+def save_data_sqlite(df, db_path="products.db", table="products"):
+    """Simpan DataFrame ke tabel SQLite (tabel lama ditimpa)."""
+    with closing(sqlite3.connect(db_path)) as conn:
+        df.to_sql(table, conn, if_exists='replace', index=False)
+    print(f"✅ Data berhasil disimpan ke {db_path} (tabel {table})")
 
-        sheet.values().update(
-            spreadsheetId=spreadsheet_id,
-            range=range_sheet,
-            valueInputOption='RAW',
-            body=body
-        ).execute()
-        print(f"✅ Data berhasil disimpan di Google Sheets pada {range_sheet}")
+def save_data_parquet(df, nama_file="products.parquet"):
+    """Simpan DataFrame ke file Parquet (membutuhkan pyarrow atau fastparquet)."""
+    df.to_parquet(nama_file, index=False)
+    print(f"✅ Data berhasil disimpan ke {nama_file}")
 
-    except Exception as e:
-        print(f"❌ Gagal simpan ke Google Sheets: {e}")
\ No newline at end of file
+
+@dataclass
+class Sink:
+    """Konfigurasi satu tujuan penyimpanan beserta kebijakan retry dan timeout-nya."""
+    name: str
+    func: object
+    kwargs: dict
+    retries: int = 0
+    timeout: float = None
+    backoff: float = 1.0
+
+
+@dataclass
+class SinkResult:
+    """Hasil eksekusi satu sink."""
+    name: str
+    ok: bool
+    attempts: int
+    duration: float
+    error: str = None
+    skipped: bool = False
+
+
+SINKS = {}
+
+
+def register_sink(name, func, retries=0, timeout=None, backoff=1.0, **kwargs):
+    """Daftarkan sink. ``kwargs`` diteruskan ke ``func(df, **kwargs)`` saat dijalankan."""
+    SINKS[name] = Sink(name, func, kwargs, retries=retries, timeout=timeout, backoff=backoff)
+    return SINKS[name]
+
+
+def _call_with_timeout(func, df, kwargs, timeout):
+    """Jalankan func di thread terpisah dan tunggu maksimal ``timeout`` detik."""
+    hasil = {}
+
+    def target():
+        try:
+            func(df, **kwargs)
+        except BaseException as e:
+            hasil['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise SinkTimeout(f"melebihi batas waktu {timeout} detik")
+    if 'error' in hasil:
+        raise hasil['error']
+
+
+def _run_sink(sink, df):
+    start = time.perf_counter()
+    error = None
+    for attempt in range(1, sink.retries + 2):
+        try:
+            _call_with_timeout(sink.func, df, sink.kwargs, sink.timeout)
+            return SinkResult(sink.name, True, attempt, time.perf_counter() - start)
+        except SinkSkipped as e:
+            return SinkResult(sink.name, False, attempt, time.perf_counter() - start, str(e),
+                              skipped=True)
+        except SinkTimeout as e:
+            # Thread percobaan ini tidak bisa dihentikan; retry akan berjalan berdampingan
+            # dengan penulis yang sama (file CSV/SQLite, checkpoint Sheets), jadi berhenti.
+            error = e
+            break
+        except Exception as e:
+            error = e
+            if attempt <= sink.retries:
+                time.sleep(sink.backoff * attempt)
+    return SinkResult(sink.name, False, attempt, time.perf_counter() - start, str(error))
+
+
+def load_to_sinks(df, names=None):
+    """Jalankan sink terdaftar secara paralel atas DataFrame yang sama.
+
+    Sink tidak boleh mengubah ``df``. Nama sink yang tidak terdaftar dilaporkan sebagai
+    SinkResult gagal. Mengembalikan dict nama sink -> SinkResult tanpa mencetak apa pun;
+    pelaporan status diserahkan ke pemanggil. Total waktu load ditentukan oleh sink
+    paling lambat, bukan jumlahnya.
+    """
+    names = list(names if names is not None else SINKS)
+    hasil = {
+        name: SinkResult(name, False, 0, 0.0, f"Sink {name} tidak terdaftar")
+        for name in names if name not in SINKS
+    }
+    sinks = [SINKS[name] for name in names if name in SINKS]
+
+    if sinks:
+        with ThreadPoolExecutor(max_workers=len(sinks)) as executor:
+            futures = {sink.name: executor.submit(_run_sink, sink, df) for sink in sinks}
+            hasil.update((name, future.result()) for name, future in futures.items())
+    return hasil
@@ -0,0 +1,104 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class StageProfiler:
+    """Profiling opsional per tahap pipeline dengan cProfile dan tracemalloc.
+
+    Jika ``output_dir`` None, ``stage()`` tidak melakukan apa pun. Jika aktif,
+    setiap tahap menghasilkan ``<tahap>.prof`` dan ``<tahap>_alloc.txt``, dan
+    ``write_summary()`` menulis ringkasan fungsi terberat ke ``summary.txt``.
+
+    Di Python < 3.12 thread yang dibuat selama tahap diberi profiler sendiri.
+    Statistiknya diambil saat tahap selesai, jadi pekerjaan thread setelah itu
+    tidak ikut tercatat. Profiler thread yang masih hidup tidak bisa dilepas
+    dari thread lain dan tetap menambah overhead sampai thread itu selesai,
+    jadi tutup pool thread (fetcher, executor) di dalam tahapnya.
+    """
+
+    def __init__(self, output_dir=None, top=15):
+        self.output_dir = output_dir
+        self.top = top
+        self.summaries = []
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    @property
+    def enabled(self):
+        return bool(self.output_dir)
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager yang mem-profile satu tahap pipeline."""
+        if not self.enabled:
+            yield
+            return
+
+        profile = cProfile.Profile()
+        thread_profiles = []
+        if sys.version_info < (3, 12):
+            # Sebelum 3.12 cProfile hanya mencatat thread pemanggil; thread baru
+            # (mis. sink paralel atau hedged request) diberi profiler sendiri.
+            def hook(frame, event, arg):
+                thread_profile = cProfile.Profile()
+                thread_profiles.append(thread_profile)
+                thread_profile.enable()
+            threading.setprofile(hook)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            duration = time.perf_counter() - start
+            threading.setprofile(None)
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            stats = pstats.Stats(profile)
+            for thread_profile in thread_profiles:
+                # disable() menghentikan pencatatan dan mengambil snapshot statistik
+                # saat ini; event setelah tahap selesai tidak masuk ke profil tahap ini.
+                thread_profile.disable()
+                stats.add(thread_profile)
+            self._write_stage(name, stats, snapshot, duration, peak)
+
+    def _write_stage(self, name, stats, snapshot, duration, peak):
+        prof_path = os.path.join(self.output_dir, f"{name}.prof")
+        stats.dump_stats(prof_path)
+
+        alloc_path = os.path.join(self.output_dir, f"{name}_alloc.txt")
+        with open(alloc_path, 'w') as f:
+            f.write(f"Peak memori: {peak / 1024:.1f} KiB\n\n")
+            for stat in snapshot.statistics('lineno')[:self.top]:
+                f.write(f"{stat}\n")
+
+        buffer = io.StringIO()
+        stats.stream = buffer
+        stats.sort_stats('tottime').print_stats(self.top)
+        self.summaries.append((name, duration, peak, buffer.getvalue()))
+        print(f"📊 Profil tahap {name} disimpan ke {prof_path}")
+
+    def write_summary(self):
+        """Tulis ringkasan semua tahap ke ``summary.txt`` dan kembalikan path-nya."""
+        if not self.enabled or not self.summaries:
+            return None
+
+        summary_path = os.path.join(self.output_dir, "summary.txt")
+        with open(summary_path, 'w') as f:
+            for name, duration, peak, hottest in self.summaries:
+                f.write(f"=== {name}: {duration:.3f} detik, peak memori {peak / 1024:.1f} KiB ===\n")
+                f.write(hottest)
+                f.write("\n")
+        print(f"📊 Ringkasan profiling disimpan ke {summary_path}")
+        return summary_path
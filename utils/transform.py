@@ -1,13 +1,19 @@
+import sqlite3
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
-def transform_data(data_product):
-    if not data_product:
-        return pd.DataFrame(columns=['title', 'price', 'rating', 'colors', 'size', 'gender', 'timestamp'])
+from utils.cache import fingerprint_records
 
-    df = pd.DataFrame(data_product)
+COLUMNS = ['title', 'price', 'rating', 'colors', 'size', 'gender', 'timestamp']
 
+# Naikkan setiap kali logika clean_partition berubah (kurs, regex, tipe data), agar
+# partisi lama di PartitionCache tidak dipakai lagi.
+TRANSFORM_VERSION = 1
+
+
+def clean_partition(df):
+    """Bersihkan baris-baris produk. Operasi per baris, sehingga aman per halaman."""
     if 'title' in df.columns:
         df = df[~df['title'].str.lower().str.contains('unknown', na=False)]
 
@@ -29,9 +35,65 @@ def transform_data(data_product):
     df['size'] = df['size'].replace(r'Size:\s*', '', regex=True)
     df['gender'] = df['gender'].replace(r'Gender:\s*', '', regex=True)
 
+    return df
+
+
+def _finalize(df):
+    """Langkah global: hapus duplikat lintas halaman dan beri timestamp."""
     df.drop_duplicates(inplace=True)
     df.dropna(inplace=True)
 
     df['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
     return df
+
+
+def transform_data(data_product):
+    if not data_product:
+        return pd.DataFrame(columns=COLUMNS)
+
+    df = pd.DataFrame(data_product)
+    return _finalize(clean_partition(df))
+
+
+def transform_pages(pages, cache=None):
+    """Transform data per halaman dan gabungkan sebelum dedup global.
+
+    ``pages`` adalah daftar (url, daftar produk mentah). Jika ``cache``
+    (PartitionCache) diberikan, hanya halaman yang konten mentahnya berubah
+    yang ditransform ulang; sisanya diambil dari partisi yang tersimpan. Cache
+    hanya optimasi: jika tidak bisa dibaca, semua halaman ditransform ulang.
+    """
+    pages = [(url, produk) for url, produk in pages if produk]
+    if not pages:
+        return pd.DataFrame(columns=COLUMNS)
+
+    fingerprints = {
+        url: f"v{TRANSFORM_VERSION}:{fingerprint_records(produk)}" for url, produk in pages
+    }
+    cached = {}
+    if cache is not None:
+        try:
+            cached = cache.get_many(fingerprints)
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache transform tidak bisa dibaca, semua halaman ditransform ulang: {e}")
+
+    partitions = []
+    baru = []
+    for url, produk in pages:
+        if url in cached:
+            partitions.append(cached[url])
+            continue
+        partition = clean_partition(pd.DataFrame(produk))
+        partitions.append(partition)
+        baru.append((url, fingerprints[url], partition))
+
+    if cache is not None:
+        try:
+            cache.put_many(baru)
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache transform tidak bisa disimpan: {e}")
+        print(f"♻️ {len(cached)} halaman diambil dari cache, {len(baru)} halaman ditransform ulang")
+
+    df = pd.concat(partitions, ignore_index=True)
+    return _finalize(df)